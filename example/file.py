@@ -30,14 +30,24 @@ class SpanishFile(File):
         super().__init__(path)
         self.words = []
         self.grammar_rules = []
+        self._handlers = {
+            TasksSection: self._match_tasks,
+            WordSection: self._match_word,
+            GrammarSection: self._match_grammar_rule,
+        }
 
     def on_match(self, section: Section):
-        if isinstance(section, TasksSection):
-            self.tasks = section.tasks
-        elif isinstance(section, WordSection):
-            self.words.append(section.word)
-        elif isinstance(section, GrammarSection):
-            self.grammar_rules.append(section.grammar_rule)
+        if handler := self._handlers.get(type(section)):
+            handler(section)
+
+    def _match_tasks(self, section: TasksSection):
+        self.tasks = section.tasks
+
+    def _match_word(self, section: WordSection):
+        self.words.append(section.word)
+
+    def _match_grammar_rule(self, section: GrammarSection):
+        self.grammar_rules.append(section.grammar_rule)
 
     def on_complete(self):
         # Perform extra validation
@@ -6,6 +6,7 @@ from librum.patterns import (
     RE_TAGS_PATTERN,
     RE_TITLE_PATTERN,
     RE_CAPITALISED_WORD_PATTERN,
+    RE_CAPITALISED_WORDS_PATTERN,
     RE_ANY_TEXT_EXCEPT_NEW_LINE_PATTERN,
 )
 from example.models import Task, Example, Word, GrammarRule
@@ -34,17 +35,19 @@ class TasksSection(Section):
         self.tasks = []
 
     def on_match(self, definition: LineDefinition, match: re.Match):
-        if definition == self.LINE_DEFINITIONS[1]:
+        if definition is self.LINE_DEFINITIONS[1]:
             tick, title = match.groups()
-            self.tasks.append(Task(title=title, completed=tick == "x"))
+            self.tasks.append(
+                Task.model_construct(title=title, completed=tick == "x")
+            )
 
 
-EXAMPLES_LINE_DEFINITIONS = [
-    LineDefinition("^Examples:$"),
-    LineDefinition(
-        rf"- ({RE_TITLE_PATTERN}) \(({RE_TITLE_PATTERN})\)", count=-1
-    ),
-]
+# Shared by reference, so both sections match the same compiled patterns
+EXAMPLES_DEFINITION = LineDefinition("^Examples:$")
+EXAMPLE_DEFINITION = LineDefinition(
+    rf"- ({RE_TITLE_PATTERN}) \(({RE_TITLE_PATTERN})\)", count=-1
+)
+EXAMPLES_LINE_DEFINITIONS = (EXAMPLES_DEFINITION, EXAMPLE_DEFINITION)
 
 
 class WordSection(Section):
@@ -52,12 +55,10 @@ class WordSection(Section):
         LineDefinition(rf"^W\) ({RE_CAPITALISED_WORD_PATTERN})$"),
         LineDefinition(rf"^Meaning: ({RE_CAPITALISED_WORD_PATTERN})$"),
         LineDefinition(
-            rf"^Synonyms: ({RE_CAPITALISED_WORD_PATTERN})(?:, ({RE_CAPITALISED_WORD_PATTERN}))*$",
-            optional=True,
+            rf"^Synonyms: {RE_CAPITALISED_WORDS_PATTERN}$", optional=True
         ),
         LineDefinition(
-            rf"^Antonyms: ({RE_CAPITALISED_WORD_PATTERN})(?:, ({RE_CAPITALISED_WORD_PATTERN}))*$",
-            optional=True,
+            rf"^Antonyms: {RE_CAPITALISED_WORDS_PATTERN}$", optional=True
         ),
         *EXAMPLES_LINE_DEFINITIONS,
     ]
@@ -71,28 +72,44 @@ class WordSection(Section):
         self._examples: t.List[Example] = []
 
     def on_match(self, definition: LineDefinition, match: re.Match):
-        if definition == self.LINE_DEFINITIONS[0]:
-            self._text = match.groups()[0]
-        elif definition == self.LINE_DEFINITIONS[1]:
-            self._meaning = match.groups()[0]
-        elif definition == self.LINE_DEFINITIONS[2]:
-            groups = [g for g in match.groups() if g]
-            if (synonyms := set(groups)) and len(synonyms) > len(groups):
-                raise SectionError("Cannot have duplicate synonyms")
-            self._synonyms = synonyms
-        elif definition == self.LINE_DEFINITIONS[3]:
-            groups = [g for g in match.groups() if g]
-            if (antonyms := set(groups)) and len(antonyms) > len(groups):
-                raise SectionError("Cannot have duplicate antonyms")
-            self._antonyms = antonyms
-        elif definition == self.LINE_DEFINITIONS[5]:
-            text, translation = match.groups()
-            self._examples.append(
-                Example(text=text, translation=translation)
-            )
+        if handler := self._HANDLERS.get(id(definition)):
+            handler(self, match)
+
+    def _match_text(self, match: re.Match):
+        self._text = match.groups()[0]
+
+    def _match_meaning(self, match: re.Match):
+        self._meaning = match.groups()[0]
+
+    def _match_synonyms(self, match: re.Match):
+        self._add_words(match, self._synonyms, "synonyms")
+
+    def _match_antonyms(self, match: re.Match):
+        self._add_words(match, self._antonyms, "antonyms")
+
+    @staticmethod
+    def _add_words(match: re.Match, words: t.Set[str], kind: str):
+        for word in match.groups()[0].split(", "):
+            if word in words:
+                raise SectionError(f"Cannot have duplicate {kind}")
+            words.add(word)
+
+    def _match_example(self, match: re.Match):
+        text, translation = match.groups()
+        self._examples.append(
+            Example.model_construct(text=text, translation=translation)
+        )
+
+    _HANDLERS = {
+        id(LINE_DEFINITIONS[0]): _match_text,
+        id(LINE_DEFINITIONS[1]): _match_meaning,
+        id(LINE_DEFINITIONS[2]): _match_synonyms,
+        id(LINE_DEFINITIONS[3]): _match_antonyms,
+        id(EXAMPLE_DEFINITION): _match_example,
+    }
 
     def on_complete(self):
-        self.word = Word(
+        self.word = Word.model_construct(
             text=self._text,
             meaning=self._meaning,
             synonyms=self._synonyms,
@@ -115,18 +132,29 @@ class GrammarSection(Section):
         self._examples: t.List[Example] = []
 
     def on_match(self, definition: LineDefinition, match: re.Match):
-        if definition == self.LINE_DEFINITIONS[0]:
-            self._text = match.groups()[0]
-        elif definition == self.LINE_DEFINITIONS[1]:
-            self._explanation = match.groups()[0]
-        elif definition == self.LINE_DEFINITIONS[3]:
-            text, translation = match.groups()
-            self._examples.append(
-                Example(text=text, translation=translation)
-            )
+        if handler := self._HANDLERS.get(id(definition)):
+            handler(self, match)
+
+    def _match_text(self, match: re.Match):
+        self._text = match.groups()[0]
+
+    def _match_explanation(self, match: re.Match):
+        self._explanation = match.groups()[0]
+
+    def _match_example(self, match: re.Match):
+        text, translation = match.groups()
+        self._examples.append(
+            Example.model_construct(text=text, translation=translation)
+        )
+
+    _HANDLERS = {
+        id(LINE_DEFINITIONS[0]): _match_text,
+        id(LINE_DEFINITIONS[1]): _match_explanation,
+        id(EXAMPLE_DEFINITION): _match_example,
+    }
 
     def on_complete(self):
-        self.grammar_rule = GrammarRule(
+        self.grammar_rule = GrammarRule.model_construct(
             text=self._text,
             explanation=self._explanation,
             examples=self._examples,
@@ -1,6 +1,10 @@
 from pathlib import Path
 
+import pytest
+
+from librum.sections import Line, SectionError
 from example.file import SpanishFile
+from example.sections import WordSection
 
 
 def test_parse():
@@ -43,3 +47,17 @@ def test_parse():
             {"text": "Ella está cansada", "translation": "She is tired"},
         ],
     }
+
+
+@pytest.mark.parametrize("kind", ["Synonyms", "Antonyms"])
+def test_parse_failure_with_duplicate_words(kind: str):
+    # Given
+    section = WordSection(Line(0, "W) Feliz"))
+    section.consume_line(Line(1, "Meaning: Happy"))
+
+    # Then
+    with pytest.raises(
+        SectionError, match=f"Cannot have duplicate {kind.lower()}"
+    ):
+        # When
+        section.consume_line(Line(2, f"{kind}: Contento, Alegre, Contento"))
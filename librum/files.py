@@ -1,9 +1,9 @@
 import re
 import abc
 import inspect
+import functools
 from pathlib import Path
 from dataclasses import dataclass
-from collections import defaultdict
 import typing as t
 
 from librum.sections import (
@@ -18,17 +18,42 @@ from librum.patterns import (
     NEW_LINE,
     SEPARATOR,
     SEPARATOR_RAW,
-    RE_TAG_PATTERN,
-    RE_TAGS_PATTERN,
-    RE_FILE_TAG_PATTERN,
+    RE_TAG_RE,
+    RE_TAGS_RE,
+    RE_FILE_TAG_RE,
+    RE_INLINE_FLAGS_PATTERN,
+    CompiledPattern,
+    compile_pattern,
 )
 from librum.errors import FileDefinitionError, FileError
 
-Index = Count = int
+Index: t.TypeAlias = int
+Count: t.TypeAlias = int
 File_ = t.TypeVar("File_", bound="File")
 
+# Numbered backreferences and conditionals point at other groups once the
+# headers are wrapped and joined, and inline flags would no longer lead
+# the pattern (Python 3.10 then applies them to every alternative), so
+# such headers are matched one by one.
+_UNCOMBINABLE_RE = re.compile(rf"\\[1-9]|\(\?\(|{RE_INLINE_FLAGS_PATTERN}")
 
-@dataclass
+
+@functools.lru_cache(maxsize=1024)
+def _read_file_tag(path: str, mtime_ns: int, size: int) -> str:
+    # The modification time and size are part of the cache key only,
+    # so that edited files are read again. A rewrite keeping the size
+    # within one tick of the filesystem's timestamps still returns the
+    # previous tag.
+    with open(path, mode="r") as file:
+        lines = [file.readline().rstrip(NEW_LINE) for _ in range(2)]
+
+    _, tags_line = tuple(lines)
+    if not RE_TAGS_RE.match(tags_line):
+        raise FileError(f"Invalid tags {tags_line!r}.")
+    return RE_TAG_RE.findall(tags_line)[0]
+
+
+@dataclass(slots=True)
 class SectionInfo:
     section: Section
     definition: SectionDefinition
@@ -44,7 +69,7 @@ class SectionInfo:
         return True
 
 
-@dataclass
+@dataclass(slots=True)
 class SectionCount:
     count: int
     subsections_counts: t.Mapping[str, "SectionCount"]
@@ -54,9 +79,36 @@ class File(abc.ABC):
     FILE_TAG: str
     SECTION_DEFINITIONS: t.Sequence[SectionDefinition] = []
 
-    __FILE_TYPES: t.ClassVar[t.List[t.Type]] = []
-
-    __definition_counts: t.Dict[str, Count]
+    # Registered file types keyed by their file tags
+    __FILE_TYPES: t.ClassVar[t.Dict[str, t.Type]] = {}
+    __ALL_DEFINITIONS: t.ClassVar[t.List[SectionDefinition]]
+    # Siblings from which selection continues after each definition
+    __FOLLOWING_DEFINITIONS: t.ClassVar[
+        t.Dict[int, t.Tuple[SectionDefinition, ...]]
+    ]
+    # Expected definitions keyed by the matched definition's identity
+    # and the counts of all the definitions.
+    __EXPECTED_DEFINITIONS: t.ClassVar[
+        t.Dict[
+            t.Tuple[int, t.Tuple[Count, ...]],
+            t.Sequence[SectionDefinition],
+        ]
+    ]
+    # Alternations and literal prefixes of the expected definitions'
+    # header patterns, keyed by the identities of the expected definitions.
+    __EXPECTED_MATCHERS: t.ClassVar[
+        t.Dict[
+            t.Tuple[int, ...],
+            t.Tuple[t.Optional[CompiledPattern], t.Tuple[str, ...]],
+        ]
+    ]
+
+    # Counts keyed by the identities of the definitions. Unlimited
+    # definitions stop counting at 1, so the counts stay bounded.
+    __definition_counts: t.Dict[int, Count]
+    __expected_definitions: t.Sequence[SectionDefinition]
+    __expected_regex: t.Optional[CompiledPattern]
+    __expected_prefixes: t.Tuple[str, ...]
     number_of_lines: Count = 0
 
     @property
@@ -67,9 +119,7 @@ class File(abc.ABC):
     def __is_definition_consumed(
         self, definition: SectionDefinition
     ) -> bool:
-        definition_count = self.__definition_counts.get(
-            definition.identifier, 0
-        )
+        definition_count = self.__definition_counts[id(definition)]
         if definition.optional and definition_count == 0:
             return True
 
@@ -82,30 +132,49 @@ class File(abc.ABC):
     ) -> bool:
         if definition.count == -1:
             return True
-        return definition.count > self.__definition_counts.get(
-            definition.identifier, 0
-        )
+        return definition.count > self.__definition_counts[id(definition)]
 
     def __is_file_consumed(self) -> bool:
         return all(
-            [
-                self.__is_definition_consumed(definition)
-                for definition in self.SECTION_DEFINITIONS
-            ]
+            self.__is_definition_consumed(definition)
+            for definition in self.SECTION_DEFINITIONS
         )
 
     def __init_subclass__(cls, **_):
         if inspect.isabstract(cls):
             return
-        if not re.match(RE_FILE_TAG_PATTERN, cls.FILE_TAG):
+        if not RE_FILE_TAG_RE.match(cls.FILE_TAG):
             raise FileDefinitionError("Invalid file tag.")
-        if cls.FILE_TAG in {cls_.FILE_TAG for cls_ in cls.__FILE_TYPES}:
+        if cls.FILE_TAG in cls.__FILE_TYPES:
             raise FileDefinitionError("Duplicates file tag.")
-        cls.__FILE_TYPES.append(cls)
+        cls.__FILE_TYPES[cls.FILE_TAG] = cls
 
         if not cls.SECTION_DEFINITIONS:
             raise FileDefinitionError("Must have at least one section.")
         SectionDefinitionsValidator.validate(cls.SECTION_DEFINITIONS)
+        cls.__ALL_DEFINITIONS = []
+        cls.__FOLLOWING_DEFINITIONS = {}
+        cls.__index_definitions(cls.SECTION_DEFINITIONS)
+        cls.__EXPECTED_DEFINITIONS = {}
+        cls.__EXPECTED_MATCHERS = {}
+
+    @classmethod
+    def __index_definitions(
+        cls, definitions: t.Sequence[SectionDefinition]
+    ):
+        for index, definition in enumerate(definitions):
+            cls.__ALL_DEFINITIONS.append(definition)
+            # Unordered definitions continue from the start of their block
+            start_index = index
+            if not definition.ordered:
+                while (
+                    not definitions[start_index].ordered and start_index > 0
+                ):
+                    start_index -= 1
+            cls.__FOLLOWING_DEFINITIONS[id(definition)] = tuple(
+                definitions[start_index:]
+            )
+            cls.__index_definitions(definition.subsections)
 
     @classmethod
     @t.final
@@ -114,30 +183,28 @@ class File(abc.ABC):
             raise FileError("Cannot match abstract files.")
 
         try:
-            with open(path, mode="r") as file:
-                lines = [file.readline().rstrip(NEW_LINE) for _ in range(2)]
+            # Resolved, so that every path to a file shares one cache entry
+            resolved_path = path.resolve()
+            stat = resolved_path.stat()
+            file_tag = _read_file_tag(
+                resolved_path.as_posix(), stat.st_mtime_ns, stat.st_size
+            )
         except FileNotFoundError:
             raise FileError("File does not exist")
 
-        # Match tag
-        _, tags_line = tuple(lines)
-        if not re.compile(RE_TAGS_PATTERN).match(tags_line):
-            raise FileError(f"Invalid tags {tags_line!r}.")
-        file_tag = re.findall(RE_TAG_PATTERN, tags_line)[0]
-
-        file_types = cls.__FILE_TYPES if cls is File else [cls]
-        matched_file_type = None
-        for file_type in file_types:
-            if file_tag == file_type.FILE_TAG:
-                matched_file_type = file_type
-                break
+        if cls is File:
+            matched_file_type = cls.__FILE_TYPES.get(file_tag)
+        else:
+            matched_file_type = cls if file_tag == cls.FILE_TAG else None
         if not matched_file_type:
             raise FileError(f"Invalid {file_tag!r} tag for {cls.__name__}.")
         return matched_file_type(path)
 
     def __init__(self, path: Path):
         self.path = path
-        self.__definition_counts = defaultdict(int)
+        self.__definition_counts = {
+            id(definition): 0 for definition in self.__ALL_DEFINITIONS
+        }
         self.__update_expected_definitions()
 
     @t.final
@@ -154,6 +221,7 @@ class File(abc.ABC):
                 "before all sections were completed."
             )
         self.__expected_definitions = []
+        self.__expected_regex, self.__expected_prefixes = None, ()
         self.on_complete()
 
     @abc.abstractmethod
@@ -167,150 +235,232 @@ class File(abc.ABC):
 
     def __update_count(self, section_info: SectionInfo):
         if not section_info.has_updated_count:
-            key = section_info.definition.identifier
-            self.__definition_counts[key] += 1
+            definition = section_info.definition
+            counts = self.__definition_counts
+            if definition.count != -1 or not counts[id(definition)]:
+                counts[id(definition)] += 1
             section_info.has_updated_count = True
 
     def __clear_subsections_count(self, section_info: SectionInfo):
         # The count is cleared for newly-matched sections with subsections,
         # because we keep count only for the latest subsections.
+        counts = self.__definition_counts
         for subsection in section_info.definition.subsections:
-            if subsection.identifier in self.__definition_counts:
-                del self.__definition_counts[subsection.identifier]
+            counts[id(subsection)] = 0
 
     def __update_expected_definitions(
         self, matched_definition: t.Optional[SectionDefinition] = None
     ):
-        self.__expected_definitions = self.__select_expected_definitions(
-            definition=matched_definition or self.SECTION_DEFINITIONS[0]
-        )
+        definition = matched_definition or self.SECTION_DEFINITIONS[0]
+        key = (id(definition), tuple(self.__definition_counts.values()))
+        if key not in self.__EXPECTED_DEFINITIONS:
+            self.__EXPECTED_DEFINITIONS[
+                key
+            ] = self.__select_expected_definitions(definition)
+        self.__expected_definitions = self.__EXPECTED_DEFINITIONS[key]
+        (
+            self.__expected_regex,
+            self.__expected_prefixes,
+        ) = self.__compile_expected_matchers(self.__expected_definitions)
+
+    @classmethod
+    def __compile_expected_matchers(
+        cls, definitions: t.Sequence[SectionDefinition]
+    ) -> t.Tuple[t.Optional[CompiledPattern], t.Tuple[str, ...]]:
+        key = tuple(id(definition) for definition in definitions)
+        if key in cls.__EXPECTED_MATCHERS:
+            return cls.__EXPECTED_MATCHERS[key]
+        if not definitions:
+            # An empty alternation would match every line
+            cls.__EXPECTED_MATCHERS[key] = None, ()
+            return None, ()
+
+        headers = [
+            definition.section.LINE_DEFINITIONS[0]
+            for definition in definitions
+        ]
+        regex: t.Optional[CompiledPattern] = None
+        if not any(
+            _UNCOMBINABLE_RE.search(header.pattern) for header in headers
+        ):
+            try:
+                regex = compile_pattern(
+                    "|".join(
+                        f"(?P<definition_{index}>{header.pattern})"
+                        for index, header in enumerate(headers)
+                    )
+                )
+            except re.error:
+                # Patterns which cannot be combined (e.g. with
+                # clashing group names) are also matched one by one.
+                pass
+        # Lines can be rejected by their prefix only if every header has one
+        prefixes = tuple(header.prefix for header in headers)
+        if not all(prefixes):
+            prefixes = ()
+
+        cls.__EXPECTED_MATCHERS[key] = regex, prefixes
+        return regex, prefixes
 
     def __select_expected_definitions(
-        self, definition: SectionDefinition, selecting_upwards: bool = False
+        self, definition: SectionDefinition
     ) -> t.Sequence[SectionDefinition]:
         expected_definitions: t.List[SectionDefinition] = []
 
-        if selecting_upwards or not definition.subsections:
-            siblings = (
-                self.SECTION_DEFINITIONS
-                if not definition.parent
-                else definition.parent.subsections
-            )
-            index = siblings.index(definition)
-
-            if not definition.ordered:
-                while not siblings[index].ordered and index > 0:
-                    index -= 1
-
-            possible_definitions = list(siblings[index:])
+        if not definition.subsections:
+            possible_definitions = self.__FOLLOWING_DEFINITIONS[
+                id(definition)
+            ]
         else:
-            possible_definitions = list(definition.subsections)
-
-        has_unconsumed_unordered = False
-        for definition in possible_definitions:
-            if definition.ordered:
-                if has_unconsumed_unordered:
-                    break
-                if self.__can_definition_consume_more(definition):
-                    expected_definitions.append(definition)
-                if not self.__is_definition_consumed(definition):
-                    break
+            possible_definitions = definition.subsections
+
+        # Walks up the parents for as long as the last sibling is reached
+        while True:
+            has_unconsumed_unordered = False
+            for definition in possible_definitions:
+                if definition.ordered:
+                    if has_unconsumed_unordered:
+                        break
+                    if self.__can_definition_consume_more(definition):
+                        expected_definitions.append(definition)
+                    if not self.__is_definition_consumed(definition):
+                        break
+                else:
+                    if self.__can_definition_consume_more(definition):
+                        expected_definitions.append(definition)
+                    if (
+                        not has_unconsumed_unordered
+                        and not self.__is_definition_consumed(definition)
+                    ):
+                        has_unconsumed_unordered = True
             else:
-                if self.__can_definition_consume_more(definition):
-                    expected_definitions.append(definition)
-                if (
-                    not has_unconsumed_unordered
-                    and not self.__is_definition_consumed(definition)
-                ):
-                    has_unconsumed_unordered = True
-            if (
-                definition == possible_definitions[-1]
-                and definition.parent
-                and not has_unconsumed_unordered
-            ):
-                expected_definitions.extend(
-                    self.__select_expected_definitions(
-                        definition.parent, selecting_upwards=True
-                    )
-                )
+                parent = possible_definitions[-1].parent
+                if parent and not has_unconsumed_unordered:
+                    possible_definitions = self.__FOLLOWING_DEFINITIONS[
+                        id(parent)
+                    ]
+                    continue
+            break
+
         return sorted(
             expected_definitions,
             key=lambda d: d.priority,
             reverse=True,
         )
 
-    def __match_definition(
-        self, line: Line
-    ) -> t.Tuple[t.Optional[SectionInfo], t.Sequence[SectionError]]:
-        section_info: t.Optional[SectionInfo] = None
+    def __match_definition(self, line: Line) -> t.Optional[SectionInfo]:
+        start_index = 0
+        matched_index: t.Optional[Index] = None
+        if self.__expected_regex:
+            if not (match := self.__expected_regex.match(line.text)):
+                return None
+            # The first alternative whose header matches the line
+            start_index = matched_index = int(
+                match.lastgroup.rpartition("_")[2]
+            )
+
+        for index, definition in enumerate(
+            self.__expected_definitions[start_index:], start_index
+        ):
+            # Only instantiate sections whose header matches the line
+            if index != matched_index and not definition.can_match(
+                line.text
+            ):
+                continue
+            try:
+                return SectionInfo(definition.section(line), definition)
+            except SectionError:
+                continue
+        return None
+
+    def __match_errors(self, line: Line) -> t.Sequence[SectionError]:
         errors: t.List[SectionError] = []
         for definition in self.__expected_definitions:
             try:
-                section = definition.section(line)
-                section_info = SectionInfo(section, definition)
-                break
+                definition.section(line)
             except SectionError as error:
                 errors.append(error)
-        return section_info, errors
+        return errors
 
     @t.final
     def __parse_sections(self):
         section_info: t.Optional[SectionInfo] = None
 
-        with open(self.path.as_posix(), "r") as raw_file:
-            raw_lines = raw_file.readlines()
-        self.number_of_lines = len(raw_lines)
-
-        for index, raw_line in enumerate(raw_lines):
-            line = Line(index, raw_line)
-
-            # Always start by trying to match a new section
-            matched_section_info, errors = self.__match_definition(line)
-            if matched_section_info and (
-                matched_section_info.can_interrupt(section_info)
-                if section_info
-                else True
-            ):
-                if section_info:
-                    if not section_info.section.completed:
-                        section_info.section.on_end()
-                        self.__on_match(section_info)
-                    self.__validate_separators(
-                        matched_section_info, raw_lines
-                    )
+        consecutive_separators_count = 0
+        self.number_of_lines = 0
 
-                section_info = matched_section_info
-                # Check if one-line sections are completed
-                if section_info.section.completed:
-                    self.__on_match(section_info)
-                if section_info.definition.subsections:
-                    self.__clear_subsections_count(section_info)
-                self.__update_expected_definitions(section_info.definition)
-                continue
-
-            elif section_info and not section_info.section.completed:
-                section_info.section.consume_line(line)
-                if (
-                    not section_info.has_updated_count
-                    and section_info.section.has_consumed_all_definitions()
+        with open(self.path.as_posix(), "r") as raw_file:
+            for index, raw_line in enumerate(raw_file):
+                self.number_of_lines += 1
+                # Separators immediately preceding the current line
+                preceding_separators_count = consecutive_separators_count
+                consecutive_separators_count = (
+                    consecutive_separators_count + 1
+                    if raw_line == SEPARATOR_RAW
+                    else 0
+                )
+                line = Line(index, raw_line)
+
+                # Always start by trying to match a new section, unless
+                # the line starts with none of the expected headers' prefixes.
+                # Every header match starts with its prefix, so skipped lines
+                # could not have matched any of the expected headers.
+                matched_section_info = (
+                    self.__match_definition(line)
+                    if not self.__expected_prefixes
+                    or line.text.startswith(self.__expected_prefixes)
+                    else None
+                )
+                if matched_section_info and (
+                    matched_section_info.can_interrupt(section_info)
+                    if section_info
+                    else True
                 ):
-                    self.__update_count(section_info)
+                    if section_info:
+                        if not section_info.section.completed:
+                            section_info.section.on_end()
+                            self.__on_match(section_info)
+                        self.__validate_separators(
+                            matched_section_info, preceding_separators_count
+                        )
+
+                    section_info = matched_section_info
+                    # Check if one-line sections are completed
+                    if section_info.section.completed:
+                        self.__on_match(section_info)
+                    if section_info.definition.subsections:
+                        self.__clear_subsections_count(section_info)
                     self.__update_expected_definitions(
                         section_info.definition
                     )
-                if section_info.section.completed:
-                    self.__on_match(section_info)
-                continue
+                    continue
+
+                elif section_info and not section_info.section.completed:
+                    section_info.section.consume_line(line)
+                    if (
+                        not section_info.has_updated_count
+                        and section_info.section.has_consumed_all_definitions()
+                    ):
+                        self.__update_count(section_info)
+                        self.__update_expected_definitions(
+                            section_info.definition
+                        )
+                    if section_info.section.completed:
+                        self.__on_match(section_info)
+                    continue
 
-            elif line.text == SEPARATOR:
-                continue
+                elif line.text == SEPARATOR:
+                    continue
 
-            # Error if no section has been matched
-            errors_str = "\n".join([f"– {str(error)}" for error in errors])
-            raise FileError(
-                f"{self.name}: Could not match any section.\n"
-                f"Errors:\n{errors_str}"
-            )
+                # Error if no section has been matched
+                errors = self.__match_errors(line)
+                errors_str = "\n".join(
+                    [f"– {str(error)}" for error in errors]
+                )
+                raise FileError(
+                    f"{self.name}: Could not match any section.\n"
+                    f"Errors:\n{errors_str}"
+                )
 
         if section_info and not section_info.section.completed:
             section_info.section.on_end()
@@ -318,15 +468,11 @@ class File(abc.ABC):
         self.__on_complete()
 
     def __validate_separators(
-        self, section_info: SectionInfo, raw_lines: t.Sequence[str]
+        self, section_info: SectionInfo, separators_count: Count
     ):
-        to_index = section_info.section.starting_line_index
-        from_index = to_index - section_info.definition.separator_count
-        if (
-            set(raw_lines[from_index:to_index]) != {SEPARATOR_RAW}
-            or raw_lines[from_index - 1] == SEPARATOR_RAW
-        ):
+        if separators_count != section_info.definition.separator_count:
             raise FileError(
                 f"{self.name}: Invalid separator count for"
-                f" {section_info.section.name} at line {to_index}."
+                f" {section_info.section.name}"
+                f" at line {section_info.section.starting_line_index}."
             )
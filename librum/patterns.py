@@ -1,5 +1,17 @@
+import os
+import re
+import functools
+import types
+import typing as t
+
 Pattern = str
 
+# Opt-in RE2 engine (pip install google-re2) for linear-time matching.
+# RE2 differs from re, e.g. \w only matches ASCII, hence it is not default.
+_re2: t.Optional[types.ModuleType] = None
+if os.environ.get("LIBRUM_REGEX_ENGINE") == "re2":
+    import re2 as _re2
+
 SEPARATOR = ""
 SEPARATOR_RAW = "\n"
 RE_SEPARATOR_PATTERN = "^$"
@@ -19,16 +31,26 @@ RE_DATE_PATTERN = (
     r"((?:[0-2][0-9]|(?:3)[0-1])/(?:0[0-9]|1[0-2])/(?:[2-9][0-9]{3}))"
 )
 
+# The repeated class contains \w, so on failure the final \w can only take
+# back one character at a time: matching stays linear in the line length.
 RE_TITLE_PATTERN = r"[A-Z][\w,-:–'& ]+\w"
 RE_SENTENCE_PATTERN = r"[A-Z][\w,-:–'& ]+\w[\.\!\?]"
 RE_QUESTION_PATTERN = r"[A-Z][\w,-:–'& ]+\w\?"
 RE_CAPITALISED_WORD_PATTERN = r"[A-Z][a-z-]+"
+# Captures the whole comma-separated list in one group, to be split on ", ".
+# A repeated group would only capture its last repetition.
+RE_CAPITALISED_WORDS_PATTERN = (
+    rf"({RE_CAPITALISED_WORD_PATTERN}(?:, {RE_CAPITALISED_WORD_PATTERN})*)"
+)
 
 RE_FILE_TITLE_PATTERN = r"^## ([A-Z][\w,-:–'& ]+\w)$"
 RE_FILE_TAG_PATTERN = r"^([a-z]{2,}_)+file$"
+RE_FILE_TAG_RE = re.compile(RE_FILE_TAG_PATTERN)
 
 RE_TAG_PATTERN = r"((?:(?:[a-z]+[_]{1})+[a-zA-Z]+)|(?:[a-z]+))"
 RE_TAGS_PATTERN = rf"^`(?:\[{RE_TAG_PATTERN}\])+`$"
+RE_TAG_RE = re.compile(RE_TAG_PATTERN)
+RE_TAGS_RE = re.compile(RE_TAGS_PATTERN)
 
 RE_PAGES_GROUP_PATTERN = r"([0-9ivxlc]+)"
 RE_PAGES_TAG_MULTIPLE_PATTERN = (
@@ -46,3 +68,83 @@ RE_ANY_TEXT_PATTERN = r"^(?: +)?((?:[^ #].*)|(?:))$"
 RE_ANY_TEXT_EXCEPT_NEW_LINE_PATTERN = r"^(?: +)?((?:[^ #]\w.*))$"
 
 RE_ROMAN_NUMBER_PATTERN = r"([IVXLCDM]+)"
+
+# Python 3.10 applies inline flags anywhere in a pattern to all of it
+RE_INLINE_FLAGS_PATTERN = r"\(\?-?[aiLmsux]"
+RE_INLINE_FLAGS_RE = re.compile(RE_INLINE_FLAGS_PATTERN)
+
+
+# A pattern compiled with either re or RE2, whose match returns the
+# engine's match object or None
+class CompiledPattern(t.Protocol):
+    def match(self, string: str) -> t.Any:
+        ...
+
+
+# Shared by definitions with the same pattern. Falls back to re for
+# patterns the engine does not support (e.g. lookarounds in RE2).
+@functools.lru_cache(maxsize=1024)
+def compile_pattern(pattern: Pattern) -> CompiledPattern:
+    if _re2:
+        try:
+            return _re2.compile(pattern)
+        except _re2.error:
+            pass
+    return re.compile(pattern)
+
+
+_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+
+# Literal text every match starts with, empty when it cannot be determined
+def literal_prefix(pattern: Pattern) -> str:
+    # Flags such as (?i) change what the literal text matches
+    if RE_INLINE_FLAGS_RE.search(pattern) or _has_top_level_alternation(
+        pattern
+    ):
+        return ""
+
+    prefix: t.List[str] = []
+    index = 1 if pattern.startswith("^") else 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            # Escaped letters and digits are classes or references (\w, \1)
+            if index + 1 == len(pattern) or pattern[index + 1].isalnum():
+                break
+            char = pattern[index + 1]
+            next_index = index + 2
+        elif char in _METACHARACTERS:
+            break
+        else:
+            next_index = index + 1
+        # A quantified character is not guaranteed to be in the match
+        if next_index < len(pattern) and pattern[next_index] in "*+?{":
+            break
+        prefix.append(char)
+        index = next_index
+    return "".join(prefix)
+
+
+def _has_top_level_alternation(pattern: Pattern) -> bool:
+    depth = 0
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == "[":
+            # Skip the character class, where "]" can be its first member
+            index += 2 if pattern[index + 1 : index + 2] == "^" else 1
+            index += 1 if pattern[index : index + 1] == "]" else 0
+            while index < len(pattern) and pattern[index] != "]":
+                index += 2 if pattern[index] == "\\" else 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        index += 1
+    return False
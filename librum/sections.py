@@ -2,17 +2,24 @@ import abc
 import re
 import inspect
 from enum import IntEnum
-from dataclasses import dataclass
-from collections import defaultdict
+from dataclasses import dataclass, field
 import typing as t
 
-from librum.patterns import Pattern, SEPARATOR_RAW, RE_SEPARATOR_PATTERN
+from librum.patterns import (
+    Pattern,
+    SEPARATOR_RAW,
+    RE_SEPARATOR_PATTERN,
+    CompiledPattern,
+    compile_pattern,
+    literal_prefix,
+)
 from librum.errors import SectionDefinitionError, SectionError
 
-Index = Count = int
+Index: t.TypeAlias = int
+Count: t.TypeAlias = int
 
 
-@dataclass
+@dataclass(slots=True)
 class Line:
     index: Index
     text: str
@@ -27,24 +34,43 @@ class Line:
         return f"{self.index}:{self.text!r}"
 
 
-@dataclass
+@dataclass(slots=True)
 class LineDefinition:
     pattern: Pattern
     optional: bool = False
     ordered: bool = True
     count: Count = 1  # -1 for unlimited
+    regex: CompiledPattern = field(init=False, repr=False, compare=False)
+    prefix: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.regex = compile_pattern(self.pattern)
+        self.prefix = literal_prefix(self.pattern)
 
 
 class Section(abc.ABC):
     LINE_DEFINITIONS: t.Sequence[LineDefinition]
     END_PATTERN: t.Optional[Pattern] = None
+    __end_regex: t.Optional[CompiledPattern] = None
+    __DEFINITION_INDICES: t.ClassVar[t.Dict[int, Index]]
+    # Keyed by the matched definition index and the definition counts
+    __EXPECTED_DEFINITIONS: t.ClassVar[
+        t.Dict[
+            t.Tuple[Index, t.Tuple[Count, ...]],
+            t.Tuple[LineDefinition, ...],
+        ]
+    ]
 
     starting_line_index: Index
     ending_line_index: t.Optional[Index] = None
     last_consumed_line: Line
 
     __expected_definitions: t.Sequence[LineDefinition]
-    __definition_counts: t.Dict[Index, Count]
+    # Indexed as LINE_DEFINITIONS. Unlimited definitions stop counting
+    # at 1, so the counts stay bounded and can key the class cache.
+    __definition_counts: t.List[Count]
+    # Cleared whenever a count changes
+    __has_consumed_all_definitions: t.Optional[bool]
 
     @property
     def name(self):
@@ -98,6 +124,8 @@ class Section(abc.ABC):
 
         last_definition = cls.LINE_DEFINITIONS[-1]
         is_last_definition_unlimited = last_definition.count == -1
+        # Always detected with re, whose $ matches before a trailing
+        # newline unlike RE2's, so the engine does not change sections
         if is_last_definition_unlimited and not re.match(
             last_definition.pattern, SEPARATOR_RAW
         ):
@@ -110,17 +138,27 @@ class Section(abc.ABC):
                 "The END_PATTERN has no effect if the last definition is"
                 " not optional or has no unlimited repeated count (-1)."
             )
+        cls.__end_regex = (
+            compile_pattern(cls.END_PATTERN) if cls.END_PATTERN else None
+        )
+        cls.__DEFINITION_INDICES = {}
+        for index, definition in enumerate(cls.LINE_DEFINITIONS):
+            # Keyed by identity, so equal but distinct definitions keep
+            # their own indices. The same object repeated maps to its first.
+            cls.__DEFINITION_INDICES.setdefault(id(definition), index)
+        cls.__EXPECTED_DEFINITIONS = {}
 
     def __init__(self, starting_line: Line):
         self.starting_line_index = starting_line.index
         self.last_consumed_line = starting_line
-        self.__expected_definitions = [self.LINE_DEFINITIONS[0]]
-        self.__definition_counts = defaultdict(Count)
+        self.__expected_definitions = (self.LINE_DEFINITIONS[0],)
+        self.__definition_counts = [0] * len(self.LINE_DEFINITIONS)
+        self.__has_consumed_all_definitions = None
         self.consume_line(starting_line)
 
     def __get_definition_count(self, definition: LineDefinition) -> Count:
         return self.__definition_counts[
-            self.LINE_DEFINITIONS.index(definition)
+            self.__DEFINITION_INDICES[id(definition)]
         ]
 
     def __can_definition_consume_more(
@@ -139,27 +177,26 @@ class Section(abc.ABC):
         ) or definition.count == definition_count
 
     def has_consumed_all_definitions(self) -> bool:
-        return all(
-            [
+        if self.__has_consumed_all_definitions is None:
+            self.__has_consumed_all_definitions = all(
                 self.__is_definition_consumed(definition)
                 for definition in self.LINE_DEFINITIONS
-            ]
-        )
+            )
+        return self.__has_consumed_all_definitions
 
     @t.final
     def consume_line(self, line: Line):
         if self.completed:
             raise SectionError(f"{self.name} already completed.")
 
-        if self.END_PATTERN and self.__match_end_pattern(line):
+        if self.__end_regex and self.__match_end_pattern(line):
             self.__on_complete(ending_line=self.last_consumed_line)
             return
 
         match: t.Optional[re.Match] = None
         matched_definition: t.Optional[LineDefinition] = None
         for definition in self.__expected_definitions:
-            re_expression = re.compile(definition.pattern)
-            if match := re_expression.match(line.text):
+            if match := definition.regex.match(line.text):
                 matched_definition = definition
                 break
         if not match or not matched_definition:
@@ -176,28 +213,28 @@ class Section(abc.ABC):
         self.last_consumed_line = line
         self.__on_match(matched_definition, match)
         self.__update_expected_definitions(matched_definition)
-        if not any(
-            [
-                self.__can_definition_consume_more(definition)
-                for definition in self.__expected_definitions
-            ]
-        ):
+        # Only definitions that can consume more are expected
+        if not self.__expected_definitions:
             self.__on_complete(line)
 
     def __match_end_pattern(self, line: Line) -> bool:
-        if not self.has_consumed_all_definitions():
+        # The precompiled regex is cheaper than checking the counts
+        if not (self.__end_regex and self.__end_regex.match(line.text)):
             return False
-        if self.END_PATTERN and re.match(self.END_PATTERN, line.text):
-            return True
-        return False
+        return self.has_consumed_all_definitions()
 
     def __on_match(
         self,
         matched_definition: LineDefinition,
         match: re.Match,
     ):
-        index = self.LINE_DEFINITIONS.index(matched_definition)
-        self.__definition_counts[index] += 1
+        index = self.__DEFINITION_INDICES[id(matched_definition)]
+        if (
+            matched_definition.count != -1
+            or not self.__definition_counts[index]
+        ):
+            self.__definition_counts[index] += 1
+        self.__has_consumed_all_definitions = None
         self.on_match(matched_definition, match)
 
     @abc.abstractmethod
@@ -224,18 +261,28 @@ class Section(abc.ABC):
     def __update_expected_definitions(
         self, matched_definition: LineDefinition
     ):
-        index = self.LINE_DEFINITIONS.index(matched_definition)
+        index = self.__DEFINITION_INDICES[id(matched_definition)]
+        key = (index, tuple(self.__definition_counts))
+        expected_definitions = self.__EXPECTED_DEFINITIONS.get(key)
+        if expected_definitions is None:
+            expected_definitions = self.__select_expected_definitions(
+                matched_definition
+            )
+            self.__EXPECTED_DEFINITIONS[key] = expected_definitions
+        self.__expected_definitions = expected_definitions
+
+    def __select_expected_definitions(
+        self, matched_definition: LineDefinition
+    ) -> t.Tuple[LineDefinition, ...]:
+        index = self.__DEFINITION_INDICES[id(matched_definition)]
         if not matched_definition.ordered:
             while not self.LINE_DEFINITIONS[index].ordered:
                 index -= 1
 
         expected_definitions: t.List[LineDefinition] = []
-        possible_definitions: t.List[LineDefinition] = list(
-            self.LINE_DEFINITIONS[index:]
-        )
-
         has_unconsumed_unordered = False
-        for definition in possible_definitions:
+        for index in range(index, len(self.LINE_DEFINITIONS)):
+            definition = self.LINE_DEFINITIONS[index]
             if definition.ordered:
                 if has_unconsumed_unordered:
                     break
@@ -252,7 +299,7 @@ class Section(abc.ABC):
                 ):
                     has_unconsumed_unordered = True
 
-        self.__expected_definitions = expected_definitions
+        return tuple(expected_definitions)
 
 
 class SectionPriority(IntEnum):
@@ -267,29 +314,36 @@ class SectionPriority(IntEnum):
     HIGHER = 3
 
 
-@dataclass
+# Definitions are compared by identity, which is how they are used,
+# rather than recursively through their subsections and parent
+@dataclass(eq=False, slots=True)
 class SectionDefinition:
     section: t.Type[Section]
-    subsections: t.Sequence["SectionDefinition"]
+    subsections: t.Tuple["SectionDefinition", ...]
     parent: t.Optional["SectionDefinition"]
     optional: bool
     ordered: bool
     count: Count  # -1 for unlimited
     priority: SectionPriority
     separator_count: Count
+    # Built lazily
+    _identifier: str = field(init=False, repr=False)
+    _all_subsection_types: t.FrozenSet[t.Type[Section]] = field(
+        init=False, repr=False
+    )
 
     @property
     def identifier(self) -> str:
         if hasattr(self, "_identifier"):
             return self._identifier
 
-        identifiers = [str(id(self))]
-        parent = self.parent
-        while parent:
-            identifiers.insert(0, str(id(parent)))
-            parent = parent.parent
+        identifiers = []
+        definition: t.Optional[SectionDefinition] = self
+        while definition:
+            identifiers.append(str(id(definition)))
+            definition = definition.parent
 
-        self._identifier = "_".join(identifiers)
+        self._identifier = "_".join(reversed(identifiers))
         return self._identifier
 
     def __init__(
@@ -305,7 +359,7 @@ class SectionDefinition:
         separator_count: Count = 1,
     ):
         self.section = section
-        self.subsections = subsections or []
+        self.subsections = tuple(subsections) if subsections else ()
         self.parent = parent
         self.optional = optional
         self.ordered = ordered
@@ -316,47 +370,68 @@ class SectionDefinition:
             for subsection in self.subsections:
                 subsection.parent = self
 
-    def all_subsection_types(self) -> t.Set[t.Type[Section]]:
-        def collect_subsection_definitions(
-            definition: "SectionDefinition",
-        ) -> t.Set[t.Type[Section]]:
-            subsections = set()
-            for subsection in definition.subsections:
-                subsections.add(subsection.section)
-                subsections.update(
-                    collect_subsection_definitions(subsection)
-                )
-            return subsections
+    def can_match(self, text: str) -> bool:
+        return bool(self.section.LINE_DEFINITIONS[0].regex.match(text))
+
+    def all_subsection_types(self) -> t.FrozenSet[t.Type[Section]]:
+        if hasattr(self, "_all_subsection_types"):
+            return self._all_subsection_types
+
+        subsection_types: t.Set[t.Type[Section]] = set()
+        for subsection in self.subsections:
+            subsection_types.add(subsection.section)
+            subsection_types.update(subsection.all_subsection_types())
 
-        return collect_subsection_definitions(self)
+        self._all_subsection_types = frozenset(subsection_types)
+        return self._all_subsection_types
 
 
 class SectionDefinitionsValidator:
     root_definitions: t.Sequence[SectionDefinition]
+    sibling_indices: t.Dict[int, Index]
 
     @classmethod
     def validate(cls, root_definitions: t.Sequence[SectionDefinition]):
         cls.root_definitions = root_definitions
-        cls._validate_definitions(root_definitions)
+        cls.sibling_indices = {}
+        cls._index_siblings(root_definitions)
 
-    @classmethod
-    def _validate_definitions(
-        cls, definitions: t.Sequence[SectionDefinition]
-    ):
-        for definition in definitions:
-            next_possible_sections = cls._next_possible_sections(definition)
-            if definition.section in next_possible_sections:
-                raise SectionDefinitionError(
-                    f"{definition.section.__name__} cannot be duplicated"
-                    " by the next possible section definitions."
-                )
+        # Depth-first in definition order, without recursion
+        stack: t.List[t.Iterator[SectionDefinition]] = [
+            iter(root_definitions)
+        ]
+        while stack:
+            definition = next(stack[-1], None)
+            if not definition:
+                stack.pop()
+                continue
+            cls._validate_definition(definition)
             if definition.subsections:
-                if definition.section in definition.all_subsection_types():
-                    raise SectionDefinitionError(
-                        f"{definition.section.__name__} cannot be"
-                        " defined as a subsection of itself."
-                    )
-                cls._validate_definitions(definition.subsections)
+                cls._index_siblings(definition.subsections)
+                stack.append(iter(definition.subsections))
+
+    @classmethod
+    def _index_siblings(cls, siblings: t.Sequence[SectionDefinition]):
+        for index, definition in enumerate(siblings):
+            # Keyed by identity; the same object repeated maps to its first
+            cls.sibling_indices.setdefault(id(definition), index)
+
+    @classmethod
+    def _validate_definition(cls, definition: SectionDefinition):
+        next_possible_sections = cls._next_possible_sections(definition)
+        if definition.section in next_possible_sections:
+            raise SectionDefinitionError(
+                f"{definition.section.__name__} cannot be duplicated"
+                " by the next possible section definitions."
+            )
+        if (
+            definition.subsections
+            and definition.section in definition.all_subsection_types()
+        ):
+            raise SectionDefinitionError(
+                f"{definition.section.__name__} cannot be"
+                " defined as a subsection of itself."
+            )
 
     @classmethod
     def _next_possible_sections(
@@ -367,17 +442,17 @@ class SectionDefinitionsValidator:
             if not definition.parent
             else definition.parent.subsections
         )
-        index = siblings.index(definition)
+        index = cls.sibling_indices[id(definition)]
 
         if selecting_upwards and not definition.ordered:
             while not siblings[index].ordered and index > 0:
                 index -= 1
 
         possible_sections = []
-        possible_definitions = siblings[index:]
         last_continued_definition = None
 
-        for possible_definition in possible_definitions:
+        for index in range(index, len(siblings)):
+            possible_definition = siblings[index]
             # Whenever we select upwards, we always add the definition
             # If at root however, we do not add the definition we're validating
             if selecting_upwards or possible_definition is not definition:
@@ -403,7 +478,7 @@ class SectionDefinitionsValidator:
 
         if (
             last_continued_definition
-            and last_continued_definition == possible_definitions[-1]
+            and last_continued_definition is siblings[-1]
             and last_continued_definition.parent
         ):
             possible_sections.extend(
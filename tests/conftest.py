@@ -10,16 +10,18 @@ from librum.patterns import RE_TAGS_PATTERN
 
 class File_(File):
     matched_sections = []
-    on_match_calls = 0
     on_complete_calls = 0
 
     def __init__(self, *args, **kwargs):
         self.matched_sections = []
         super().__init__(*args, **kwargs)
 
+    @property
+    def on_match_calls(self) -> int:
+        return len(self.matched_sections)
+
     def match_(self, section: Section):
         self.matched_sections.append(section.__class__)
-        self.on_match_calls += 1
 
     def on_complete(self):
         self.on_complete_calls += 1
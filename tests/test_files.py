@@ -1,3 +1,5 @@
+import sys
+
 import pytest
 
 from librum.patterns import SEPARATOR
@@ -966,3 +968,161 @@ def test_file_with_interrupting_priority(test_file: FileMock):
         OverlngSection,
         InterruptingSection,
     ]
+
+
+def test_file_with_trailing_separator(test_file: FileMock):
+    # Given
+    class TestFile(File_):
+        FILE_TAG = test_file.file_tag
+        SECTION_DEFINITIONS = [
+            SectionDefinition(HeaderSection),
+            SectionDefinition(BodySection),
+        ]
+
+        def on_match(self, section: Section):
+            self.match_(section)
+
+    test_file.write(
+        "Header",
+        f"`[{test_file.file_tag}]`",
+        SEPARATOR,
+        "Body",
+        SEPARATOR,
+        SEPARATOR,
+    )
+
+    # When
+    file = TestFile(test_file.path)
+    file.parse()
+
+    # Then
+    assert file.matched_sections == [HeaderSection, BodySection]
+
+
+@pytest.mark.parametrize("separator_count", [0, 1, 2])
+def test_file_with_separator_count(
+    test_file: FileMock, separator_count: int
+):
+    # Given
+    class TestFile(File_):
+        FILE_TAG = test_file.file_tag
+        SECTION_DEFINITIONS = [
+            SectionDefinition(HeaderSection),
+            SectionDefinition(BodySection, separator_count=separator_count),
+        ]
+
+        def on_match(self, section: Section):
+            self.match_(section)
+
+    test_file.write(
+        "Header",
+        f"`[{test_file.file_tag}]`",
+        *((SEPARATOR,) * separator_count),
+        "Body",
+    )
+
+    # When
+    file = TestFile(test_file.path)
+    file.parse()
+
+    # Then
+    assert file.matched_sections == [HeaderSection, BodySection]
+
+
+def test_file_with_backreference_in_header(test_file: FileMock):
+    # Given
+    class PairSection(Section_):
+        LINE_DEFINITIONS = [LineDefinition(r"^(\w+)=\1$")]
+
+    class TestFile(File_):
+        FILE_TAG = test_file.file_tag
+        SECTION_DEFINITIONS = [
+            SectionDefinition(HeaderSection),
+            SectionDefinition(BodySection, optional=True),
+            SectionDefinition(PairSection),
+        ]
+
+        def on_match(self, section: Section):
+            self.match_(section)
+
+    test_file.write(
+        "Header",
+        f"`[{test_file.file_tag}]`",
+        SEPARATOR,
+        "ab=ab",
+    )
+
+    # When
+    file = TestFile(test_file.path)
+    file.parse()
+
+    # Then
+    assert file.matched_sections == [HeaderSection, PairSection]
+
+
+def test_file_with_inline_flags_in_header(test_file: FileMock):
+    # Given
+    class WordSection(Section_):
+        LINE_DEFINITIONS = [LineDefinition(r"^W\) (\w+)$")]
+
+    class AsciiNoteSection(Section_):
+        LINE_DEFINITIONS = [LineDefinition(r"(?a)^Note$")]
+
+    class TestFile(File_):
+        FILE_TAG = test_file.file_tag
+        SECTION_DEFINITIONS = [
+            SectionDefinition(HeaderSection),
+            SectionDefinition(AsciiNoteSection, optional=True),
+            SectionDefinition(WordSection),
+        ]
+
+        def on_match(self, section: Section):
+            self.match_(section)
+
+    test_file.write(
+        "Header",
+        f"`[{test_file.file_tag}]`",
+        SEPARATOR,
+        "W) está",
+    )
+
+    # When
+    file = TestFile(test_file.path)
+    file.parse()
+
+    # Then
+    assert file.matched_sections == [HeaderSection, WordSection]
+
+
+@pytest.mark.skipif(
+    sys.version_info >= (3, 11),
+    reason="Inline flags must lead the pattern since Python 3.11",
+)
+@pytest.mark.parametrize(
+    "pattern, line", [("Tasks(?i)", "TASKS"), ("Ta(?i)sks", "tasks")]
+)
+def test_file_with_inline_flags_after_header_prefix(
+    test_file: FileMock, pattern: str, line: str
+):
+    # Given
+    class TasksSection(Section_):
+        LINE_DEFINITIONS = [LineDefinition(pattern)]
+
+    class TestFile(File_):
+        FILE_TAG = test_file.file_tag
+        SECTION_DEFINITIONS = [
+            SectionDefinition(HeaderSection),
+            SectionDefinition(TasksSection),
+        ]
+
+        def on_match(self, section: Section):
+            self.match_(section)
+
+    test_file.write("Header", f"`[{test_file.file_tag}]`", SEPARATOR, line)
+
+    # When
+    file = TestFile(test_file.path)
+    file.parse()
+
+    # Then
+    assert file.matched_sections == [HeaderSection, TasksSection]
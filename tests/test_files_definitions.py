@@ -87,6 +87,34 @@ def test_match(test_file: FileMock):
     assert File_.match(test_file.path)
 
 
+def test_match_rereads_resized_file(test_file: FileMock):
+    # Given
+    test_file.write("Header", "`[test_files_test_file]`")
+    File_.match(test_file.path)
+    test_file.write("Header", "`[invalid_file]`")
+
+    # Then
+    with pytest.raises(
+        FileError, match="Invalid 'invalid_file' tag for File_."
+    ):
+        # When
+        File_.match(test_file.path)
+
+
+def test_match_with_equivalent_paths(test_file: FileMock):
+    # Given
+    test_file.write("Header", "`[test_files_test_file]`")
+    directory = test_file.path.parent
+    other_path = directory / ".." / directory.name / test_file.path.name
+
+    # When
+    file = File.match(test_file.path)
+    other_file = File.match(other_path)
+
+    # Then
+    assert type(file) is type(other_file) is File_
+
+
 def test_abstract_files_are_not_matched():
     # Given
     class AbstractFile(File, abc.ABC):
@@ -387,16 +387,20 @@ def test_parse_failure_with_unconsumed_repeated_parent(test_file: FileMock):
         TestFile(test_file.path).parse()
 
 
-@pytest.mark.parametrize("count", [0, 1, 3])
+@pytest.mark.parametrize(
+    "separator_count, count", [(2, 0), (2, 1), (2, 3), (0, 1)]
+)
 def test_parse_failure_with_incorrect_number_of_separators(
-    test_file: FileMock, count: int
+    test_file: FileMock, separator_count: int, count: int
 ):
     # Given
     class TestFile(File_):
         FILE_TAG = test_file.file_tag
         SECTION_DEFINITIONS = [
             SectionDefinition(HeaderSection),
-            SectionDefinition(FooterSection, separator_count=2),
+            SectionDefinition(
+                FooterSection, separator_count=separator_count
+            ),
         ]
 
         def on_match(self, section: Section):
@@ -464,3 +468,32 @@ def test_parse_failure_with_interrupted_section(test_file: FileMock):
     ):
         # When
         TestFile(test_file.path).parse()
+
+
+def test_parse_failure_with_line_after_last_section(test_file: FileMock):
+    # Given
+    class TestFile(File_):
+        FILE_TAG = test_file.file_tag
+        SECTION_DEFINITIONS = [
+            SectionDefinition(HeaderSection),
+            SectionDefinition(BodySection),
+        ]
+
+        def on_match(self, section: Section):
+            self.match_(section)
+
+    test_file.write(
+        "Header",
+        f"`[{test_file.file_tag}]`",
+        SEPARATOR,
+        "Body",
+        SEPARATOR,
+        "Body",
+    )
+
+    # Then
+    with pytest.raises(
+        FileError, match="TestFile: Could not match any section."
+    ):
+        # When
+        TestFile(test_file.path).parse()
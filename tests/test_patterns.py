@@ -0,0 +1,47 @@
+import re
+
+import pytest
+
+from librum.patterns import literal_prefix
+
+
+@pytest.mark.parametrize(
+    "pattern, expected_prefix",
+    [
+        ("Header", "Header"),
+        ("^Tasks$", "Tasks"),
+        (r"^W\) ([A-Z][a-z-]+)$", "W) "),
+        (r"- \[(x| )\] (.+)", "- ["),
+        ("Bodies?", "Bodie"),
+        ("Body{2}", "Bod"),
+        (r"^\w+", ""),
+        ("^$", ""),
+        ("Body|Footer", ""),
+        ("[|]Body", ""),
+        ("Tasks(?i)", ""),
+        ("(?i)Tasks", ""),
+    ],
+)
+def test_literal_prefix(pattern: str, expected_prefix: str):
+    # Then
+    assert literal_prefix(pattern) == expected_prefix
+
+
+@pytest.mark.parametrize(
+    "pattern, line",
+    [
+        ("^Tasks$", "Tasks"),
+        (r"^W\) ([A-Z][a-z-]+)$", "W) Word"),
+        (r"- \[(x| )\] (.+)", "- [x] Task"),
+        ("Bodies?", "Bodie"),
+        ("Body{2}", "Bodyy"),
+        ("Body|Footer", "Footer"),
+        ("(?i)Tasks", "TASKS"),
+    ],
+)
+def test_literal_prefix_starts_every_match(pattern: str, line: str):
+    # Given
+    assert re.match(pattern, line)
+
+    # Then
+    assert line.startswith(literal_prefix(pattern))
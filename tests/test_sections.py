@@ -1,9 +1,9 @@
 import abc
-from copy import copy
 import typing as t
 
 import pytest
 
+from librum import patterns
 from librum.patterns import SEPARATOR, RE_SEPARATOR_PATTERN
 from librum.sections import Line, LineDefinition, Section, SectionError
 
@@ -42,12 +42,9 @@ def make_section(
     lines: t.List[Line],
     until_index: t.Optional[int] = None,
 ) -> Section_:
-    lines = copy(lines)
-    section = cls(lines.pop(0))
+    section = cls(lines[0])
     consume_lines(
-        # -1 because the first line has been popped
-        section,
-        lines if not until_index else lines[: until_index - 1],
+        section, lines[1:until_index] if until_index else lines[1:]
     )
     return section
 
@@ -192,6 +189,29 @@ def test_section_which_cannot_have_an_end_pattern():
             END_PATTERN = RE_SEPARATOR_PATTERN
 
 
+def test_section_end_pattern_detection_with_re2(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Given
+    re2 = pytest.importorskip("re2")
+    monkeypatch.setattr(patterns, "_re2", re2)
+    patterns.compile_pattern.cache_clear()
+
+    try:
+        # When
+        class SectionMock_(SectionMock):
+            LINE_DEFINITIONS = [
+                LineDefinition("Header"),
+                LineDefinition(r"^[a-z ]*$", count=-1),
+            ]
+
+    finally:
+        patterns.compile_pattern.cache_clear()
+
+    # Then: Detected as with re, where $ matches before the newline
+    assert SectionMock_.END_PATTERN is None
+
+
 def test_section_name():
     # Given
     section = SectionMock(starting_line=Line(0, "Header"))
@@ -346,6 +366,26 @@ def test_section_with_repeated_optional(count: int):
     assert_consumed_lines(section, lines)
 
 
+def test_section_with_equal_definitions():
+    # Given
+    class SectionMock_(SectionMock):
+        LINE_DEFINITIONS = [
+            LineDefinition("Header"),
+            LineDefinition("Body"),
+            LineDefinition(RE_SEPARATOR_PATTERN),
+            LineDefinition("Body"),
+        ]
+
+    lines = make_lines("Header", "Body", SEPARATOR, "Body")
+
+    # When
+    section = make_section(SectionMock_, lines)
+
+    # Then
+    assert section.completed
+    assert_consumed_lines(section, lines)
+
+
 def test_section_with_optional_as_last_line():
     # Given
     class SectionMock_(SectionMock):
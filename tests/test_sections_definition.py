@@ -41,6 +41,17 @@ def test_all_subsection_definitions():
     }
 
 
+@pytest.mark.parametrize(
+    "text, can_match", [("Header", True), ("Body", False)]
+)
+def test_definition_can_match(text: str, can_match: bool):
+    # Given
+    definition = SectionDefinition(HeaderSection)
+
+    # Then
+    assert definition.can_match(text) is can_match
+
+
 def test_subsection_definition_over_non_optional_in_parent():
     # Given
     definitions = [